@@ -1,8 +1,28 @@
+import random
+import sys
+
+import numpy as np
+
+
+def zero_hits(position, direction, steps):
+    """
+    Number of clicks that land on 0 while turning `steps` clicks from `position`.
+    Closed form, O(1) regardless of how large `steps` is.
+    """
+    if direction == 'R':
+        # 0 is reached after 100 - position clicks, then every 100 clicks
+        return (position + steps) // 100
+    elif direction == 'L':
+        # Mirror the dial so a left turn becomes a right turn
+        return ((100 - position) % 100 + steps) // 100
+    raise ValueError(f"Invalid direction: {direction}")
+
+
 def count_password_hits(rotations, start=50, method="part1"):
     """
     rotations: list of strings like ["L68", "R48", ...]
     start: starting position of the dial (default 50)
-    method: "part1" or "part2"
+    method: "part1", "part2" or "part2_simulate" (per-click reference for part2)
     """
     position = start
     count_zero = 0
@@ -22,7 +42,15 @@ def count_password_hits(rotations, start=50, method="part1"):
                 count_zero += 1
 
         elif method == "part2":
-            # Count every click that lands on 0
+            # Count every click that lands on 0, without simulating the clicks
+            count_zero += zero_hits(position, direction, steps)
+            if direction == 'L':
+                position = (position - steps) % 100
+            elif direction == 'R':
+                position = (position + steps) % 100
+
+        elif method == "part2_simulate":
+            # Count every click that lands on 0, one click at a time
             if direction == 'L':
                 for _ in range(steps):
                     position = (position - 1) % 100
@@ -34,20 +62,147 @@ def count_password_hits(rotations, start=50, method="part1"):
                     if position == 0:
                         count_zero += 1
         else:
-            raise ValueError("Invalid method: choose 'part1' or 'part2'")
+            raise ValueError("Invalid method: choose 'part1', 'part2' or 'part2_simulate'")
 
     return count_zero
 
 
-# Example from the puzzle
-example_rotations = ["L68", "L30", "R48", "L5", "R60", "L55", "L1", "L99", "R14", "L82"]
+def check_part2_against_simulation(trials=200, max_steps=1000, seed=0):
+    """
+    Differential check: closed-form part2 against the per-click loop on random
+    rotation logs. Returns the (start, rotations, fast, slow) cases that differ.
+    """
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(trials):
+        rotations = [rng.choice("LR") + str(rng.randint(0, max_steps))
+                     for _ in range(rng.randint(1, 20))]
+        start = rng.randrange(100)
+        fast = count_password_hits(rotations, start=start, method="part2")
+        slow = count_password_hits(rotations, start=start, method="part2_simulate")
+        if fast != slow:
+            mismatches.append((start, rotations, fast, slow))
+    return mismatches
+
+
+def load_rotation_steps(filename):
+    """
+    Load a whole rotation file as signed int64 steps (L negative, R positive).
+    Parsing is done on the raw bytes with array operations, no per-line loop.
+    """
+    buf = np.fromfile(filename, dtype=np.uint8)
+    dir_idx = np.flatnonzero((buf == ord('L')) | (buf == ord('R')))
+    digit_idx = np.flatnonzero((buf >= ord('0')) & (buf <= ord('9')))
+
+    # Each digit belongs to the rotation whose letter precedes it
+    token = np.searchsorted(dir_idx, digit_idx, side='right') - 1
+    if token.size and token[0] < 0:
+        raise ValueError("Digits found before the first rotation direction")
+    lengths = np.bincount(token, minlength=dir_idx.size)
+    if (lengths == 0).any():
+        raise ValueError("Rotation without a step count")
+
+    # Digits sit right after their letter, so the offset gives the power of ten
+    exponent = lengths[token] - (digit_idx - dir_idx[token])
+    values = (buf[digit_idx] - ord('0')).astype(np.int64) * np.power(10, exponent, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    magnitudes = np.add.reduceat(values, starts) if values.size else values
+
+    signs = np.where(buf[dir_idx] == ord('L'), -1, 1).astype(np.int64)
+    return signs * magnitudes
+
+
+def count_password_hits_batch(steps, start=50, dial_size=100):
+    """
+    steps: signed int64 array (L negative, R positive), e.g. from load_rotation_steps
+    start: starting position of the dial (default 50)
+    dial_size: number of positions on the dial (default 100)
+    Returns (part1, part2) computed without a Python-level loop.
+    """
+    steps = np.asarray(steps, dtype=np.int64)
+    if steps.size == 0:
+        return 0, 0
+
+    positions = (start + np.cumsum(steps % dial_size)) % dial_size
+    previous = np.concatenate(([start % dial_size], positions[:-1]))
+
+    part1 = int(np.count_nonzero(positions == 0))
+
+    # Same closed form as zero_hits, applied to every rotation at once
+    magnitude = np.abs(steps)
+    right = (previous + magnitude) // dial_size
+    left = ((dial_size - previous) % dial_size + magnitude) // dial_size
+    part2 = int(np.where(steps >= 0, right, left).sum())
+
+    return part1, part2
+
+
+def iter_rotations(filename, chunk_size=1 << 20):
+    """
+    Yield (direction, steps) pairs from a rotation file, reading it in
+    chunks of `chunk_size` bytes so memory stays flat for any file size.
+    """
+    pending = ""
+    with open(filename, buffering=chunk_size) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (pending + chunk).split("\n")
+            pending = lines.pop()  # last piece may be an unfinished line
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield line[0], int(line[1:])
+    pending = pending.strip()
+    if pending:
+        yield pending[0], int(pending[1:])
+
+
+def count_password_hits_stream(filename, start=50, checkpoint=0, chunk_size=1 << 20):
+    """
+    filename: rotation file, read once in chunks
+    start: starting position of the dial (default 50)
+    checkpoint: print running totals every `checkpoint` rotations (0 = never)
+    Returns (part1, part2) from a single pass over the file.
+    """
+    position = start
+    part1 = 0
+    part2 = 0
+
+    for n, (direction, steps) in enumerate(iter_rotations(filename, chunk_size), 1):
+        part2 += zero_hits(position, direction, steps)
+        if direction == 'L':
+            position = (position - steps) % 100
+        elif direction == 'R':
+            position = (position + steps) % 100
+        if position == 0:
+            part1 += 1
+
+        if checkpoint and n % checkpoint == 0:
+            print(f"  after {n} rotations: part1={part1} part2={part2}")
+
+    return part1, part2
+
+
+if __name__ == "__main__":
+    # Example from the puzzle
+    example_rotations = ["L68", "L30", "R48", "L5", "R60", "L55", "L1", "L99", "R14", "L82"]
+
+    print("Part 1 example password:", count_password_hits(example_rotations, method="part1"))  # should be 3
+    print("Part 2 example password:", count_password_hits(example_rotations, method="part2"))  # should be 6
 
-print("Part 1 example password:", count_password_hits(example_rotations, method="part1"))  # should be 3
-print("Part 2 example password:", count_password_hits(example_rotations, method="part2"))  # should be 6
+    # Optional differential check of part2 against the per-click loop
+    if "--check" in sys.argv[1:]:
+        mismatches = check_part2_against_simulation()
+        print("Part 2 closed form vs simulation:", "OK" if not mismatches else mismatches)
 
-# To solve your actual input file:
-with open("input.txt") as f:
-    rotations = [line.strip() for line in f if line.strip()]
+    # To solve your actual input file (single streaming pass for both parts):
+    actual_part1, actual_part2 = count_password_hits_stream("input.txt")
+    print("Actual Part 1 password:", actual_part1)
+    print("Actual Part 2 password:", actual_part2)
 
-print("Actual Part 1 password:", count_password_hits(rotations, method="part1"))
-print("Actual Part 2 password:", count_password_hits(rotations, method="part2"))
+    # Same answers from the vectorized batch engine
+    batch_part1, batch_part2 = count_password_hits_batch(load_rotation_steps("input.txt"))
+    print("Batch Part 1 password:", batch_part1)
+    print("Batch Part 2 password:", batch_part2)
@@ -1,22 +1,10 @@
-import pandas as pd
-
-# ---------- Part 1 ----------
-def max_joltage_two_digits(bank: str) -> int:
-    """Find the maximum two-digit joltage from a bank."""
-    max_val = 0
-    for i in range(len(bank)):
-        for j in range(i+1, len(bank)):
-            val = int(bank[i] + bank[j])  # form two-digit number
-            max_val = max(max_val, val)
-    return max_val
-
-# ---------- Part 2 ----------
-def max_joltage_twelve_digits(bank: str) -> int:
+# ---------- General k-digit selection ----------
+def max_joltage(bank, k: int) -> int:
     """
-    Find the maximum 12-digit joltage from a bank.
-    Strategy: choose the lexicographically largest subsequence of length 12.
+    Find the maximum k-digit joltage from a bank (str or bytes of digits).
+    Strategy: choose the lexicographically largest subsequence of length k
+    with a monotonic stack, O(n) for any k.
     """
-    k = 12
     stack = []
     to_remove = len(bank) - k  # how many digits we can drop
 
@@ -27,28 +15,63 @@ def max_joltage_twelve_digits(bank: str) -> int:
         stack.append(digit)
 
     # Keep only first k digits
-    result = "".join(stack[:k])
-    return int(result)
+    if isinstance(bank, str):
+        return int("".join(stack[:k]))
+    return int(bytes(stack[:k]))
+
+
+def max_joltage_batch(buffer: bytes, k: int) -> list:
+    """Maximum k-digit joltage of every bank in a newline-separated byte buffer."""
+    return [max_joltage(bank, k) for bank in buffer.split() if bank]
+
+
+# ---------- Part 1 ----------
+def max_joltage_two_digits(bank: str) -> int:
+    """Find the maximum two-digit joltage from a bank."""
+    return max_joltage(bank, 2)
+
+# ---------- Part 2 ----------
+def max_joltage_twelve_digits(bank: str) -> int:
+    """Find the maximum 12-digit joltage from a bank."""
+    return max_joltage(bank, 12)
 
 # ---------- Main ----------
-def solve_puzzle(filename: str):
-    # Read input file
-    df = pd.read_csv(filename, header=None, names=["bank"])
+def iter_banks(filename: str):
+    """Yield banks one line at a time, kept as digit strings."""
+    with open(filename) as f:
+        for line in f:
+            bank = line.strip()
+            if bank:
+                yield bank
+
 
-    # Part 1: two-digit joltage
-    df["part1_max"] = df["bank"].apply(max_joltage_two_digits)
-    total_part1 = df["part1_max"].sum()
+def solve_puzzle(filename: str, show_banks: bool = False):
+    total_part1 = 0
+    total_part2 = 0
 
-    # Part 2: twelve-digit joltage
-    df["part2_max"] = df["bank"].apply(max_joltage_twelve_digits)
-    total_part2 = df["part2_max"].sum()
+    if show_banks:
+        print("Results per bank:")
+    # Single pass: both parts per bank, nothing kept in memory
+    for index, bank in enumerate(iter_banks(filename)):
+        part1_max = max_joltage_two_digits(bank)
+        part2_max = max_joltage_twelve_digits(bank)
+        total_part1 += part1_max
+        total_part2 += part2_max
+        if show_banks:
+            print(index, bank, part1_max, part2_max)
 
-    print("Results per bank:")
-    print(df)
     print("\nTotal output joltage (Part 1):", total_part1)
     print("Total output joltage (Part 2):", total_part2)
+    return total_part1, total_part2
+
+
+def solve_puzzle_batch(filename: str):
+    """Same totals as solve_puzzle, reading the whole file as one byte buffer."""
+    with open(filename, "rb") as f:
+        buffer = f.read()
+    return sum(max_joltage_batch(buffer, 2)), sum(max_joltage_batch(buffer, 12))
 
 
 # Example run
 if __name__ == "__main__":
-    solve_puzzle("input.txt")
\ No newline at end of file
+    solve_puzzle("input.txt")
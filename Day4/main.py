@@ -1,3 +1,5 @@
+import numpy as np
+
 def read_grid(filename="input.txt"):
     with open(filename) as f:
         return [list(line.strip()) for line in f if line.strip()]
@@ -23,12 +25,52 @@ def count_accessible(grid):
                     accessible_positions.append((r, c))
     return accessible_positions
 
-def part1(grid):
+def grid_to_array(grid):
+    """Convert a list-of-lists grid to a uint8 array, 1 where there is a roll."""
+    return (np.array(grid, dtype="U1") == "@").astype(np.uint8)
+
+def neighbor_counts(rolls):
+    """Number of neighboring rolls for every cell, via shifted-slice sums."""
+    rows, cols = rolls.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = rolls
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr != 1 or dc != 1:
+                counts += padded[dr:dr + rows, dc:dc + cols]
+    return counts
+
+def accessible_mask(rolls):
+    """Boolean mask of rolls with fewer than 4 neighboring rolls."""
+    return (rolls == 1) & (neighbor_counts(rolls) < 4)
+
+def check_backend(backend):
+    if backend not in ("python", "numpy"):
+        raise ValueError(f"Invalid backend: {backend} (choose 'python' or 'numpy')")
+
+def part1(grid, backend="python"):
     """Return number of accessible rolls in initial grid."""
+    check_backend(backend)
+    if backend == "numpy":
+        return int(accessible_mask(grid_to_array(grid)).sum())
     return len(count_accessible(grid))
 
-def part2(grid):
+def part2(grid, backend="python"):
     """Simulate removal process until no more rolls accessible."""
+    check_backend(backend)
+    if backend == "numpy":
+        # Works on its own array; the list grid is not modified
+        rolls = grid_to_array(grid)
+        total_removed = 0
+        while True:
+            mask = accessible_mask(rolls)
+            removed = int(mask.sum())
+            if not removed:
+                return total_removed
+            rolls[mask] = 0
+            total_removed += removed
+
     total_removed = 0
     while True:
         accessible = count_accessible(grid)
@@ -40,14 +82,122 @@ def part2(grid):
         total_removed += len(accessible)
     return total_removed
 
-if __name__ == "__main__":
-    grid = read_grid("input.txt")
-    # Copy grid for part2 since part2 modifies it
-    import copy
-    grid_copy = copy.deepcopy(grid)
+def removal_waves(grid):
+    """
+    Incremental version of part2: neighbor counts are computed once and only
+    the 8 neighbors of a removed roll are updated. Rolls whose count drops
+    below 4 are queued for the next wave. Returns the number of rolls removed
+    in each wave; the grid is left untouched.
+    """
+    rows, cols = len(grid), len(grid[0])
+    directions = [
+        (-1, -1), (-1, 0), (-1, 1),
+        (0, -1),          (0, 1),
+        (1, -1),  (1, 0), (1, 1)
+    ]
+    # counts[r][c] = number of neighboring rolls, None where there is no roll
+    counts = [[None] * cols for _ in range(rows)]
+    for r in range(rows):
+        for c in range(cols):
+            if grid[r][c] == "@":
+                n = 0
+                for dr, dc in directions:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == "@":
+                        n += 1
+                counts[r][c] = n
+
+    wave = [(r, c) for r in range(rows) for c in range(cols)
+            if counts[r][c] is not None and counts[r][c] < 4]
+    queued = set(wave)
+    wave_sizes = []
+    while wave:
+        wave_sizes.append(len(wave))
+        next_wave = []
+        for r, c in wave:
+            counts[r][c] = None
+            for dr, dc in directions:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and counts[nr][nc] is not None:
+                    counts[nr][nc] -= 1
+                    if counts[nr][nc] < 4 and (nr, nc) not in queued:
+                        queued.add((nr, nc))
+                        next_wave.append((nr, nc))
+        wave = next_wave
+    return wave_sizes
+
+def part2_incremental(grid):
+    """Same result as part2 in time close to linear in the number of rolls."""
+    return sum(removal_waves(grid))
+
+class BitGrid:
+    """
+    Compact grid: each row is a Python int bitset where bit c is set when
+    column c holds a roll. Roughly one bit per cell instead of a str per cell.
+    """
+    _TO_BITS = str.maketrans("@.", "10")
 
-    result1 = part1(grid)
-    result2 = part2(grid_copy)
+    def __init__(self, rows, width):
+        self.rows = rows
+        self.width = width
+        self.full = (1 << width) - 1
 
-    print("Part 1 - Accessible rolls initially:", result1)
-    print("Part 2 - Total rolls removed:", result2)
+    @classmethod
+    def read(cls, filename="input.txt"):
+        rows = []
+        width = None
+        with open(filename) as f:
+            for i, line in enumerate(f):
+                line = line.strip()
+                if line:
+                    if width is None:
+                        width = len(line)
+                    elif len(line) != width:
+                        raise ValueError(f"Inconsistent row width at line {i+1}.")
+                    # reversed so that column 0 ends up in bit 0
+                    rows.append(int(line.translate(cls._TO_BITS)[::-1], 2))
+        return cls(rows, width or 0)
+
+    def accessible(self, rows=None):
+        """Per-row bitsets of rolls with fewer than 4 neighboring rolls."""
+        rows = self.rows if rows is None else rows
+        full = self.full
+        result = []
+        for r, row in enumerate(rows):
+            up = rows[r - 1] if r > 0 else 0
+            down = rows[r + 1] if r + 1 < len(rows) else 0
+            # bit-sliced counter b0..b2, `many` set once the count reaches 4
+            b0 = b1 = b2 = many = 0
+            for m in (up << 1, up, up >> 1, row << 1, row >> 1,
+                      down << 1, down, down >> 1):
+                m &= full
+                c0 = b0 & m
+                b0 ^= m
+                c1 = b1 & c0
+                b1 ^= c0
+                many |= b2 & c1
+                b2 ^= c1
+            result.append(row & ~(b2 | many))
+        return result
+
+def part1_bits(bitgrid):
+    """Part 1 on a BitGrid."""
+    return sum(row.bit_count() for row in bitgrid.accessible())
+
+def part2_bits(bitgrid):
+    """Part 2 on a BitGrid; works on a shallow copy of the row list."""
+    rows = list(bitgrid.rows)
+    total_removed = 0
+    while True:
+        accessible = bitgrid.accessible(rows)
+        removed = sum(row.bit_count() for row in accessible)
+        if not removed:
+            return total_removed
+        rows = [row & ~acc for row, acc in zip(rows, accessible)]
+        total_removed += removed
+
+if __name__ == "__main__":
+    # Bit-packed grid only: no list grid, no deep copy
+    bitgrid = BitGrid.read("input.txt")
+    print("Part 1 - Accessible rolls initially:", part1_bits(bitgrid))
+    print("Part 2 - Total rolls removed:", part2_bits(bitgrid))
@@ -1,3 +1,17 @@
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import islice
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
 def parse_input(filename):
     with open(filename, "r") as f:
         raw_lines = f.read().splitlines()
@@ -13,22 +27,115 @@ def parse_input(filename):
     return ranges, ids
 
 
+class FreshIndex:
+    """
+    Merged, sorted fresh ranges with binary-search membership lookups.
+    Can be saved to a compact binary file, memory-mapped back in and
+    extended one range at a time while keeping the total fresh-ID count.
+    """
+
+    MAGIC = b"FRSH2\0\0\0"
+    # magic, interval count, total fresh IDs; 24 bytes keeps the body 8-byte aligned
+    HEADER = struct.Struct("<8sQQ")
+
+    def __init__(self, ranges=()):
+        self.starts = array("q")
+        self.ends = array("q")
+        for start, end in sorted(ranges):
+            if self.ends and start <= self.ends[-1] + 1:
+                # overlapping or touching, extend the last interval
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+        self.total = sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+    def add(self, start, end):
+        """
+        Insert one range, merging it with any overlapping or touching intervals.
+        Finding them is O(log n) with bisect, but splicing the compact arrays
+        moves their tail, so the insert itself is O(n) (a C-level memmove).
+        The arrays are kept anyway for their small footprint and mmap format.
+        """
+        if not isinstance(self.starts, array):
+            # memory-mapped views are read-only, copy them on first write
+            self.starts = array("q", self.starts)
+            self.ends = array("q", self.ends)
+        i = bisect_left(self.ends, start - 1)
+        j = bisect_right(self.starts, end + 1)
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j - 1])
+            self.total -= sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+        self.starts[i:j] = array("q", [start])
+        self.ends[i:j] = array("q", [end])
+        self.total += end - start + 1
+
+    def save(self, path):
+        """Write header, starts and ends as raw little-endian int64."""
+        starts = array("q", self.starts)
+        ends = array("q", self.ends)
+        if sys.byteorder == "big":
+            starts.byteswap()
+            ends.byteswap()
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, len(starts), self.total))
+            f.write(bytes(starts))
+            f.write(bytes(ends))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a file written by save(). On little-endian hosts the
+        intervals are not copied; big-endian hosts get byteswapped copies.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, total = cls.HEADER.unpack_from(mapped)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not a fresh-range index: {path}")
+        body = memoryview(mapped)[cls.HEADER.size:]
+        index = cls.__new__(cls)
+        index.starts = body[:8 * n].cast("q")
+        index.ends = body[8 * n:16 * n].cast("q")
+        if sys.byteorder == "big":
+            index.starts = array("q", index.starts)
+            index.ends = array("q", index.ends)
+            index.starts.byteswap()
+            index.ends.byteswap()
+        index.total = total
+        return index
+
+    def __contains__(self, ingredient):
+        i = bisect_right(self.starts, ingredient) - 1
+        return i >= 0 and ingredient <= self.ends[i]
+
+    def contains_many(self, ids):
+        """Vectorized membership: boolean array, one entry per ID."""
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        ends = np.frombuffer(self.ends, dtype=np.int64)
+        i = np.searchsorted(starts, ids, side="right") - 1
+        found = i >= 0
+        found[found] = ids[found] <= ends[i[found]]
+        return found
+
+    def count_fresh(self, ids):
+        return int(np.count_nonzero(self.contains_many(ids)))
+
+
 def count_fresh_available(ranges, ids):
     """Part One: Count how many available IDs are fresh."""
-    fresh_count = 0
-    for ingredient in ids:
-        if any(start <= ingredient <= end for start, end in ranges):
-            fresh_count += 1
-    return fresh_count
+    index = FreshIndex(ranges)
+    return sum(1 for ingredient in ids if ingredient in index)
 
 
 def count_all_fresh_ids(ranges):
     """Part Two: Count all unique IDs considered fresh by ranges (optimized)."""
-    # Sort ranges by start
-    ranges.sort()
     merged = []
 
-    for start, end in ranges:
+    # Sort a copy by start, the caller's list is left as it was
+    for start, end in sorted(ranges):
         if not merged or start > merged[-1][1]:
             # no overlap, add new interval
             merged.append([start, end])
@@ -41,14 +148,104 @@ def count_all_fresh_ids(ranges):
     return total, merged
 
 
+def serve(index, source, out, chunk_size=65536, flush_every=65536, counts_only=False):
+    """
+    Answer ingredient IDs read from `source` (one per line) against a loaded
+    index, reading at most `chunk_size` lines at a time. Writes "fresh"/"spoiled"
+    per ID, or the running totals when counts_only is set, flushing every
+    `flush_every` lines. Blank lines are skipped. Returns (seen, fresh).
+    """
+    if chunk_size < 1 or flush_every < 1:
+        raise ValueError("chunk_size and flush_every must be at least 1")
+    seen = fresh = 0
+    since_flush = 0
+    flushed_once = False
+    while True:
+        # never read past the next flush point
+        lines = list(islice(source, min(chunk_size, flush_every - since_flush)))
+        if not lines:
+            break
+        since_flush += len(lines)
+        batch = np.array([line for line in lines if line.strip()], dtype=np.int64)
+        if len(batch):
+            verdicts = index.contains_many(batch)
+            seen += len(batch)
+            fresh += int(np.count_nonzero(verdicts))
+            if not counts_only:
+                out.write("\n".join(np.where(verdicts, "fresh", "spoiled")) + "\n")
+        if since_flush == flush_every:
+            if counts_only:
+                out.write(f"{seen} {fresh}\n")
+            out.flush()
+            since_flush = 0
+            flushed_once = True
+    # final count line, unless the last flush already wrote the same record
+    if counts_only and (since_flush or not flushed_once):
+        out.write(f"{seen} {fresh}\n")
+    out.flush()
+    return seen, fresh
+
+
+def benchmark_serve(index, n_ids=1_000_000, seed=0, **serve_kwargs):
+    """Throughput of serve() in IDs/second on random IDs drawn around the index."""
+    rng = np.random.default_rng(seed)
+    low = index.starts[0] if len(index.starts) else 0
+    high = index.ends[-1] + 1 if len(index.ends) else 1
+    ids = rng.integers(low, high, size=n_ids, dtype=np.int64)
+    source = io.StringIO("\n".join(map(str, ids.tolist())) + "\n")
+    with open(os.devnull, "w") as out:
+        t0 = time.perf_counter()
+        serve(index, source, out, **serve_kwargs)
+        elapsed = time.perf_counter() - t0
+    return n_ids / elapsed
+
+
+def main_service(argv):
+    parser = argparse.ArgumentParser(description="Long-running fresh-ID query service.")
+    parser.add_argument("mode", choices=["serve", "bench"])
+    parser.add_argument("ids", nargs="?", default="-", help="ID file, '-' for stdin")
+    parser.add_argument("--ranges", default="input.txt", help="puzzle input to take ranges from")
+    parser.add_argument("--index", help="saved FreshIndex file, used instead of --ranges")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--flush-every", type=int, default=65536)
+    parser.add_argument("--counts", action="store_true", help="write running counts only")
+    parser.add_argument("--bench-ids", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.flush_every < 1:
+        parser.error("--chunk-size and --flush-every must be at least 1")
+
+    if args.index:
+        index = FreshIndex.load(args.index)
+    else:
+        index = FreshIndex(parse_input(args.ranges)[0])
+
+    if args.mode == "bench":
+        rate = benchmark_serve(index, args.bench_ids, chunk_size=args.chunk_size,
+                               flush_every=args.flush_every, counts_only=args.counts)
+        print(f"{rate:,.0f} IDs/second")
+        return
+
+    if args.ids == "-":
+        serve(index, sys.stdin, sys.stdout, args.chunk_size, args.flush_every, args.counts)
+    else:
+        with open(args.ids) as source:
+            serve(index, source, sys.stdout, args.chunk_size, args.flush_every, args.counts)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main_service(sys.argv[1:])
+        sys.exit()
+
     ranges, ids = parse_input("input.txt")
 
     # Part One
     part1_result = count_fresh_available(ranges, ids)
     print("Part One: Number of fresh available ingredients =", part1_result)
+    print("Part One (batch lookup):", FreshIndex(ranges).count_fresh(ids))
 
     # Part Two
     part2_count, merged_ranges = count_all_fresh_ids(ranges)
     print("Part Two: Number of IDs considered fresh =", part2_count)
+    print("Part Two (index):", FreshIndex(ranges).total)
     print("Merged ranges:", merged_ranges)
@@ -1,5 +1,10 @@
 import re
 import math
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
 
 def parse_blocks(lines):
     max_w = max(len(line) for line in lines)
@@ -68,6 +73,201 @@ def solve_part2(grid, blocks, op_row):
     return total
 
 
+def product_tree(nums):
+    """
+    Product of nums by multiplying balanced pairs, so the big-integer
+    multiplications happen between operands of similar size.
+    """
+    nums = list(nums)
+    if not nums:
+        return 1
+    while len(nums) > 1:
+        paired = [nums[i] * nums[i + 1] for i in range(0, len(nums) - 1, 2)]
+        if len(nums) % 2:
+            paired.append(nums[-1])
+        nums = paired
+    return nums[0]
+
+
+def apply_op(ops, nums):
+    """Reduce a block's numbers with the operator found in its operator-row segment."""
+    if '+' in ops:
+        return sum(nums)
+    elif '*' in ops:
+        return product_tree(nums)
+    raise ValueError("No operator found")
+
+
+def reduce_block(block):
+    """(ops, row_nums, col_nums) -> (part1, part2) values of one block."""
+    ops, row_nums, col_nums = block
+    return apply_op(ops, row_nums), apply_op(ops, col_nums)
+
+
+def _reduce_blocks(blocks):
+    part1_total = part2_total = 0
+    for block in blocks:
+        part1_value, part2_value = reduce_block(block)
+        part1_total += part1_value
+        part2_total += part2_value
+    return part1_total, part2_total
+
+
+class ColumnScanner:
+    """
+    Consumes the worksheet one column at a time (a tuple of characters, the
+    operator row last). Keeps only the state of the block currently open, so
+    a block may span any number of calls.
+    """
+
+    def __init__(self, h, reduce=True):
+        self.h = h  # number of number rows
+        self.reduce = reduce  # False: return (ops, row_nums, col_nums) instead
+        self.in_block = False
+
+    def feed(self, column):
+        """Process one column; returns (part1, part2) values when a block closes."""
+        h = self.h
+        if not ''.join(column).strip():
+            return self.finish()
+        if not self.in_block:
+            self.in_block = True
+            self.row_digits = [[] for _ in range(h)]
+            self.row_done = [False] * h  # first digit run per row already ended
+            self.col_nums = []
+            self.ops = []
+
+        digits = []
+        for r in range(h):
+            ch = column[r]
+            if ch.isdigit():
+                digits.append(ch)
+                if not self.row_done[r]:
+                    self.row_digits[r].append(ch)
+            elif self.row_digits[r]:
+                self.row_done[r] = True
+        if digits:
+            self.col_nums.append(int(''.join(digits)))
+        self.ops.append(column[h])
+        return None
+
+    def finish(self):
+        """Close the open block, if any; returns its (part1, part2) values."""
+        if not self.in_block:
+            return None
+        self.in_block = False
+        row_nums = [int(''.join(d)) for d in self.row_digits if d]
+        block = (''.join(self.ops).strip(), row_nums, self.col_nums)
+        return reduce_block(block) if self.reduce else block
+
+
+def solve_both(lines):
+    """
+    Single transposed pass over the worksheet: finds block boundaries and
+    collects row-wise (part 1) and column-wise (part 2) numbers together.
+    Returns (part1_total, part2_total).
+    """
+    rows = [line.rstrip('\n') for line in lines]
+    scanner = ColumnScanner(len(rows) - 1)  # last row holds the operators
+    part1_total = part2_total = 0
+    for column in zip_longest(*rows, fillvalue=' '):
+        values = scanner.feed(column)
+        if values:
+            part1_total += values[0]
+            part2_total += values[1]
+    values = scanner.finish()
+    if values:
+        part1_total += values[0]
+        part2_total += values[1]
+    return part1_total, part2_total
+
+
+def iter_block_values_mmap(path, window=1 << 16):
+    """
+    Memory-map the worksheet and walk all rows together through column
+    windows of `window` characters. Yields (part1, part2) for each block as
+    soon as it completes; peak memory depends on the window, not the width.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # (offset, length) of every row, without the line break
+        spans = []
+        pos = 0
+        size = len(mm)
+        while pos < size:
+            nl = mm.find(b'\n', pos)
+            stop = size if nl == -1 else nl
+            length = stop - pos
+            if length and mm[stop - 1:stop] == b'\r':
+                length -= 1
+            spans.append((pos, length))
+            pos = stop + 1
+        while spans and not mm[spans[-1][0]:spans[-1][0] + spans[-1][1]].strip():
+            spans.pop()  # trailing blank lines
+
+        width = max((length for _, length in spans), default=0)
+        scanner = ColumnScanner(len(spans) - 1)
+        for c0 in range(0, width, window):
+            c1 = min(c0 + window, width)
+            pieces = []
+            for offset, length in spans:
+                piece = mm[offset + min(c0, length):offset + min(c1, length)]
+                pieces.append(piece.decode('ascii').ljust(c1 - c0))
+            for column in zip(*pieces):
+                values = scanner.feed(column)
+                if values:
+                    yield values
+        values = scanner.finish()
+        if values:
+            yield values
+
+
+def solve_mmap(path, window=1 << 16):
+    """Part 1 and part 2 totals from iter_block_values_mmap."""
+    part1_total = part2_total = 0
+    for part1_value, part2_value in iter_block_values_mmap(path, window):
+        part1_total += part1_value
+        part2_total += part2_value
+    return part1_total, part2_total
+
+
+def solve_parallel(lines, workers=None):
+    """
+    Parse every block in one column scan, then reduce the blocks on a
+    process pool (workers=1 reduces in this process) and combine the
+    partial sums. Returns (part1_total, part2_total, timings) where timings
+    holds the seconds spent parsing and reducing.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    t0 = time.perf_counter()
+    rows = [line.rstrip('\n') for line in lines]
+    scanner = ColumnScanner(len(rows) - 1, reduce=False)
+    blocks = []
+    for column in zip_longest(*rows, fillvalue=' '):
+        block = scanner.feed(column)
+        if block:
+            blocks.append(block)
+    block = scanner.finish()
+    if block:
+        blocks.append(block)
+    t1 = time.perf_counter()
+
+    n_workers = workers if workers is not None else (os.cpu_count() or 1)
+    if n_workers == 1 or len(blocks) < 2:
+        part1_total, part2_total = _reduce_blocks(blocks)
+    else:
+        # contiguous slices, one per worker, keep pickling overhead low
+        step = -(-len(blocks) // n_workers)
+        slices = [blocks[i:i + step] for i in range(0, len(blocks), step)]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            partials = list(pool.map(_reduce_blocks, slices))
+        part1_total = sum(p1 for p1, _ in partials)
+        part2_total = sum(p2 for _, p2 in partials)
+    t2 = time.perf_counter()
+
+    return part1_total, part2_total, {"parse": t1 - t0, "reduce": t2 - t1}
+
+
 def main():
     with open('input.txt', 'r', encoding='utf-8') as f:
         lines = f.readlines()
@@ -80,6 +280,22 @@ def main():
     print("Part 1 total:", part1_total)
     print("Part 2 total:", part2_total)
 
+    # Same totals from a single column scan
+    part1_single, part2_single = solve_both(lines)
+    print("Part 1 total (single pass):", part1_single)
+    print("Part 2 total (single pass):", part2_single)
+
+    # Same totals from the memory-mapped, windowed scan
+    part1_mmap, part2_mmap = solve_mmap('input.txt')
+    print("Part 1 total (mmap):", part1_mmap)
+    print("Part 2 total (mmap):", part2_mmap)
+
+    # Same totals with blocks reduced on a process pool
+    part1_par, part2_par, timings = solve_parallel(lines)
+    print("Part 1 total (parallel):", part1_par)
+    print("Part 2 total (parallel):", part2_par)
+    print(f"Parse: {timings['parse']:.4f}s, reduce: {timings['reduce']:.4f}s")
+
 
 if __name__ == '__main__':
     main()
@@ -2,6 +2,8 @@
 from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
+
 def read_grid(path: str) -> List[str]:
     text = Path(path).read_text().splitlines()
     if not text:
@@ -58,6 +60,43 @@ def count_splits_classical(grid: List[str]) -> int:
 
     return total_splits
 
+# Byte translation table: '^' -> '1', every other byte -> '0'
+SPLITTER_BITS = bytes(ord('1') if i == ord('^') else ord('0') for i in range(256))
+
+# A row step at most triples the largest count (pass-through + both sides),
+# so int64 counts above this could overflow on the next step
+COUNT_LIMIT = np.iinfo(np.int64).max // 3
+
+def splitter_mask(row: str) -> int:
+    """Bit c set when row[c] is a splitter '^'."""
+    return int(row.encode().translate(SPLITTER_BITS)[::-1], 2)
+
+def step_beams(active: int, row: str, full: int) -> Tuple[int, int]:
+    """Advance the active-beam bitset through one row; returns (next_active, splits)."""
+    splitters = splitter_mask(row)
+    hits = active & splitters
+    return ((hits << 1) | (hits >> 1) | (active & ~splitters)) & full, hits.bit_count()
+
+def count_splits_bitset(grid: List[str]) -> int:
+    """
+    Part 1 with each row's splitters and the active beams held as int bitsets
+    (bit c = column c), so a row step is a handful of bitwise operations.
+    """
+    n_rows = len(grid)
+    full = (1 << len(grid[0])) - 1
+    start_row, start_col = find_start(grid)
+
+    active = 1 << start_col
+    total_splits = 0
+
+    for r in range(start_row + 1, n_rows):
+        active, splits = step_beams(active, grid[r], full)
+        total_splits += splits
+        if not active:
+            break
+
+    return total_splits
+
 def count_timelines_quantum(grid: List[str]) -> int:
     """
     Part 2: Quantum manifold.
@@ -96,10 +135,83 @@ def count_timelines_quantum(grid: List[str]) -> int:
 
     return sum(counts)
 
+def count_timelines_numpy(grid: List[str]) -> int:
+    """
+    Part 2 with the per-column counts in a NumPy array, advanced one row at a
+    time by masked shifted adds. Switches to an object array of Python ints
+    before a step could overflow int64.
+    """
+    n_rows = len(grid)
+    n_cols = len(grid[0])
+    start_row, start_col = find_start(grid)
+
+    counts = np.zeros(n_cols, dtype=np.int64)
+    counts[start_col] = 1
+
+    for r in range(start_row + 1, n_rows):
+        counts = step_timelines(counts, grid[r])
+        if not counts.any():
+            break
+
+    return int(counts.sum())
+
+def step_timelines(counts, row: str):
+    """
+    Advance the per-column timeline counts through one row, moving to an
+    object array of Python ints first if int64 could overflow.
+    """
+    if counts.dtype != object and counts.max() > COUNT_LIMIT:
+        counts = counts.astype(object)
+    splitters = np.frombuffer(row.encode(), dtype=np.uint8) == ord('^')
+    hits = np.where(splitters, counts, 0)
+    next_counts = np.where(splitters, 0, counts)
+    next_counts[:-1] += hits[1:]
+    next_counts[1:] += hits[:-1]
+    return next_counts
+
+def solve_stream(path: str) -> Tuple[int, int]:
+    """
+    Both parts from a single read of the file, one row at a time: validates
+    the width, finds 'S' and then runs the bitset (part 1) and counts
+    (part 2) propagation together. Memory is O(width).
+    """
+    width = None
+    active = counts = None  # set once 'S' has been seen
+    total_splits = 0
+
+    with open(path) as f:
+        for i, row in enumerate(f):
+            row = row.rstrip('\r\n')
+            if width is None:
+                width = len(row)
+                full = (1 << width) - 1
+            elif len(row) != width:
+                raise ValueError(f"Inconsistent row width at line {i+1}.")
+
+            if counts is None:
+                c = row.find('S')
+                if c != -1:
+                    active = 1 << c
+                    counts = np.zeros(width, dtype=np.int64)
+                    counts[c] = 1
+                continue
+
+            # Part 1
+            if active:
+                active, splits = step_beams(active, row, full)
+                total_splits += splits
+
+            # Part 2
+            counts = step_timelines(counts, row)
+
+    if width is None:
+        raise ValueError("Empty input.")
+    if counts is None:
+        raise ValueError("No starting position 'S' found.")
+    return total_splits, int(counts.sum())
+
 def main():
-    grid = read_grid("input.txt")
-    part1 = count_splits_classical(grid)
-    part2 = count_timelines_quantum(grid)
+    part1, part2 = solve_stream("input.txt")
     print(part1)
     print(part2)
 
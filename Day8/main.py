@@ -1,6 +1,16 @@
 #!/usr/bin/env python3
 import sys
+import heapq
+import time
+import random
+import tracemalloc
+import os
+from array import array
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
 
 def parse_points(path):
     pts = []
@@ -39,6 +49,114 @@ class DSU:
         self.components -= 1
         return True
 
+class ArrayDSU:
+    """
+    DSU with parent/size in compact array('i') buffers. Keeps a histogram of
+    component sizes and the three largest sizes up to date on every union, so
+    top3_product() is O(1).
+    """
+
+    def __init__(self, n):
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.components = n
+        self.size_counts = {1: n} if n else {}
+        self.top = [1] * min(n, 3)
+
+    def find(self, a):
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        sa, sb = self.size[ra], self.size[rb]
+        if sa < sb:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] = merged = sa + sb
+        self.components -= 1
+
+        counts = self.size_counts
+        for old in (sa, sb):
+            counts[old] -= 1
+            if not counts[old]:
+                del counts[old]
+        counts[merged] = counts.get(merged, 0) + 1
+        # merged is larger than both parts, so the top sizes can only change
+        # when it beats the current smallest of them
+        if merged > self.top[-1]:
+            top = self.top
+            for old in (sa, sb):
+                if old in top:
+                    top.remove(old)
+            top.append(merged)
+            top.sort(reverse=True)
+            del top[3:]
+            if len(top) < min(3, self.components):
+                # both parts were top sizes, the next largest has to be found
+                self._refresh_top()
+        return True
+
+    def union_many(self, pairs):
+        """Union every (a, b) pair; returns how many unions were effective."""
+        if isinstance(pairs, np.ndarray):
+            pairs = pairs.tolist()
+        union = self.union
+        return sum(1 for a, b in pairs if union(a, b))
+
+    def _refresh_top(self):
+        # at most O(sqrt(n)) distinct sizes, since they sum to at most n
+        top = []
+        for size in sorted(self.size_counts, reverse=True):
+            top.extend([size] * min(self.size_counts[size], 3 - len(top)))
+            if len(top) == 3:
+                break
+        self.top = top
+
+    def top3_product(self):
+        sizes = self.top + [1] * (3 - len(self.top))
+        return sizes[0] * sizes[1] * sizes[2]
+
+def benchmark_dsu(n=10**6, unions=10**6, seed=0):
+    """
+    DSU vs ArrayDSU on the same random pairs: time per union, time of the
+    final top-3 product, and peak allocation (measured in a separate run,
+    since tracemalloc slows the timed code down).
+    """
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(unions)]
+
+    def run(cls):
+        dsu = cls(n)
+        t0 = time.perf_counter()
+        if cls is ArrayDSU:
+            dsu.union_many(pairs)
+        else:
+            for a, b in pairs:
+                dsu.union(a, b)
+        t1 = time.perf_counter()
+        product = dsu.top3_product() if cls is ArrayDSU else part1_product_of_top3(dsu)
+        t2 = time.perf_counter()
+        return product, t1 - t0, t2 - t1
+
+    results = {}
+    for cls in (DSU, ArrayDSU):
+        product, union_time, top3_time = run(cls)
+        tracemalloc.start()
+        run(cls)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[cls.__name__] = {"product": product,
+                                 "ns_per_union": union_time / unions * 1e9,
+                                 "top3_seconds": top3_time,
+                                 "peak_bytes": peak}
+    return results
+
 def squared_dist(p, q):
     dx = p[0] - q[0]
     dy = p[1] - q[1]
@@ -56,6 +174,130 @@ def build_sorted_edges(points):
     edges.sort(key=lambda e: e[0])
     return edges
 
+def _select_smallest(d2, i, j, K):
+    """Keep the K smallest (d2, i, j) triples in lexicographic order."""
+    if len(d2) > K:
+        # everything tied with the K-th distance stays, ties are resolved by (i, j)
+        kth = np.partition(d2, K - 1)[K - 1]
+        keep = d2 <= kth
+        d2, i, j = d2[keep], i[keep], j[keep]
+    order = np.lexsort((j, i, d2))[:K]
+    return d2[order], i[order], j[order]
+
+def k_closest_pairs(points, K, method="numpy", block=64):
+    """
+    The first K entries of build_sorted_edges(points) without building all
+    O(n^2) edges. method="numpy" computes distances in row blocks and keeps
+    only the K best; method="heap" streams the pairs through a bounded heap;
+    method="parallel" spreads distance tiles over a process pool (tiled_pairs).
+    """
+    if method not in ("numpy", "heap", "parallel"):
+        raise ValueError(f"Unknown method: {method}")
+    n = len(points)
+    if K <= 0 or n < 2:
+        return []
+    if method == "parallel":
+        return tiled_pairs(points, K=K)
+    if method == "heap":
+        return heapq.nsmallest(K, (
+            (squared_dist(points[i], points[j]), i, j)
+            for i in range(n) for j in range(i + 1, n)))
+
+    pts = np.array(points, dtype=np.int64)
+    best_d2 = np.empty(0, dtype=np.int64)
+    best_i = np.empty(0, dtype=np.int64)
+    best_j = np.empty(0, dtype=np.int64)
+    for i0 in range(0, n - 1, block):
+        i1 = min(i0 + block, n - 1)
+        # pairs (i, j) with i in [i0, i1) and j > i
+        d2 = np.zeros((i1 - i0, n - i0 - 1), dtype=np.int64)
+        for axis in range(3):
+            d2 += (pts[i0:i1, None, axis] - pts[None, i0 + 1:, axis]) ** 2
+        rows, cols = np.nonzero(np.arange(i0, i1)[:, None] < np.arange(i0 + 1, n)[None, :])
+        d2 = d2[rows, cols]
+        best_d2, best_i, best_j = _select_smallest(
+            np.concatenate((best_d2, d2)),
+            np.concatenate((best_i, rows + i0)),
+            np.concatenate((best_j, cols + i0 + 1)), K)
+    return list(zip(best_d2.tolist(), best_i.tolist(), best_j.tolist()))
+
+_shared_points = None
+
+def _attach_points(name, n):
+    """Pool initializer: map the shared point buffer once per worker."""
+    global _shared_points
+    shm = shared_memory.SharedMemory(name=name)
+    _shared_points = (shm, np.ndarray((n, 3), dtype=np.int64, buffer=shm.buf))
+    # pool workers leave through multiprocessing's exit hook, not atexit
+    util.Finalize(None, _detach_points, exitpriority=10)
+
+def _detach_points():
+    """Drop the array view first, the mapping cannot close while it is exported."""
+    global _shared_points
+    if _shared_points is not None:
+        shm = _shared_points[0]
+        _shared_points = None
+        shm.close()
+
+def _tile_candidates(task):
+    """
+    Squared distances for pairs (i, j), i in row block, j in column block,
+    j > i. Returns only the tile's K smallest, or the pairs with d2 <= max_d2.
+    """
+    (r0, r1), (c0, c1), K, max_d2 = task
+    pts = _shared_points[1]
+    d2 = np.zeros((r1 - r0, c1 - c0), dtype=np.int64)
+    for axis in range(3):
+        d2 += (pts[r0:r1, None, axis] - pts[None, c0:c1, axis]) ** 2
+    rows, cols = np.nonzero(np.arange(r0, r1)[:, None] < np.arange(c0, c1)[None, :])
+    d2 = d2[rows, cols]
+    i, j = rows + r0, cols + c0
+    if max_d2 is not None:
+        keep = d2 <= max_d2
+        return d2[keep], i[keep], j[keep]
+    return _select_smallest(d2, i, j, K)
+
+def tiled_pairs(points, K=None, max_d2=None, block=1024, workers=None):
+    """
+    Pairs in build_sorted_edges order, either the first K or all with
+    d2 <= max_d2, computed tile by tile on a process pool. The points live in
+    one shared-memory buffer; each worker sends back only its tile's best
+    candidates, which are merged here.
+    """
+    if (K is None) == (max_d2 is None):
+        raise ValueError("Give exactly one of K or max_d2")
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    n = len(points)
+    if n < 2 or (K is not None and K <= 0):
+        return []
+    blocks = [(b, min(b + block, n)) for b in range(0, n, block)]
+    tasks = [(rows, cols, K, max_d2)
+             for a, rows in enumerate(blocks) for cols in blocks[a:]]
+
+    shm = shared_memory.SharedMemory(create=True, size=n * 3 * 8)
+    try:
+        np.ndarray((n, 3), dtype=np.int64, buffer=shm.buf)[:] = points
+        with ProcessPoolExecutor(max_workers=workers if workers is not None else (os.cpu_count() or 1),
+                                 initializer=_attach_points,
+                                 initargs=(shm.name, n)) as pool:
+            best = (np.empty(0, dtype=np.int64),) * 3
+            parts = []
+            for d2, i, j in pool.map(_tile_candidates, tasks):
+                if max_d2 is None:
+                    best = _select_smallest(*(np.concatenate(pair) for pair in zip(best, (d2, i, j))), K)
+                else:
+                    parts.append((d2, i, j))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if max_d2 is not None:
+        d2, i, j = (np.concatenate(col) for col in zip(*parts))
+        order = np.lexsort((j, i, d2))
+        best = d2[order], i[order], j[order]
+    return list(zip(*(col.tolist() for col in best)))
+
 def part1_product_of_top3(dsu):
     reps = [dsu.find(i) for i in range(len(dsu.parent))]
     counts = Counter(reps)
@@ -64,39 +306,213 @@ def part1_product_of_top3(dsu):
         sizes.append(1)
     return sizes[0] * sizes[1] * sizes[2]
 
-def solve(path="input.txt", K=1000):
+def last_connection_brute(points):
+    """Kruskal over the full sorted edge list; returns the pair that joins the last two components."""
+    edges = build_sorted_edges(points)
+    dsu = DSU(len(points))
+    for _, i, j in edges:
+        if dsu.union(i, j):
+            # This was an effective connection
+            if dsu.components == 1:
+                return i, j
+    return None
+
+def build_kdtree(points, leaf_size=16):
+    """
+    k-d tree over the points as flat lists: node bounding boxes, children
+    (-1 for leaves) and each node's [start, end) slice of `order`. Nodes are
+    numbered in pre-order, so children always come after their parent.
+    """
+    pts = np.array(points, dtype=np.int64)
+    order = np.arange(len(points))
+    lo, hi, left, right, start, end = [], [], [], [], [], []
+    stack = [(0, len(points), None, None)]  # (start, end, parent, side)
+    while stack:
+        s, e, parent, side = stack.pop()
+        node = len(start)
+        if parent is not None:
+            (left if side == 0 else right)[parent] = node
+        block = pts[order[s:e]]
+        lo.append(tuple(block.min(axis=0).tolist()))
+        hi.append(tuple(block.max(axis=0).tolist()))
+        left.append(-1)
+        right.append(-1)
+        start.append(s)
+        end.append(e)
+        if e - s > leaf_size:
+            axis = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            mid = (e - s) // 2
+            order[s:e] = order[s:e][np.argpartition(block[:, axis], mid)]
+            stack.append((s + mid, e, node, 1))
+            stack.append((s, s + mid, node, 0))
+    return {"order": order.tolist(), "lo": lo, "hi": hi, "left": left,
+            "right": right, "start": start, "end": end}
+
+def last_connection_kdtree(points, leaf_size=16):
+    """
+    Same pair as last_connection_brute, in O(n) memory and without an edge
+    list. Edges are ordered by the key (d2, i, j), as in Kruskal, which makes
+    the MST unique; Kruskal's last effective union is its largest edge.
+    The MST is grown Boruvka-style: each round every point asks a k-d tree for
+    its nearest neighbour outside its own component, and each component joins
+    through its smallest such edge. Subtrees lying wholly inside the asking
+    point's component are skipped, and a point's previous answer is reused
+    while it still leads outside, since the set of foreign points only shrinks.
+    """
+    n = len(points)
+    if n < 2:
+        return None
+    tree = build_kdtree(points, leaf_size)
+    order, lo, hi = tree["order"], tree["lo"], tree["hi"]
+    left, right, start, end = tree["left"], tree["right"], tree["start"], tree["end"]
+    n_nodes = len(start)
+
+    def box_d2(node, x, y, z):
+        (lx, ly, lz), (hx, hy, hz) = lo[node], hi[node]
+        dx = lx - x if x < lx else (x - hx if x > hx else 0)
+        dy = ly - y if y < ly else (y - hy if y > hy else 0)
+        dz = lz - z if z < lz else (z - hz if z > hz else 0)
+        return dx * dx + dy * dy + dz * dz
+
+    def nearest_foreign(i, comp, node_comp):
+        """Smallest (d2, a, b, j) from point i to a point of another component."""
+        ci = comp[i]
+        x, y, z = points[i]
+        best = None
+        stack = [(0, 0)]  # (box distance, node)
+        while stack:
+            dist, node = stack.pop()
+            # equal distances may still win on (i, j), so only prune strictly
+            if node_comp[node] == ci or (best is not None and dist > best[0]):
+                continue
+            if left[node] == -1:
+                for j in order[start[node]:end[node]]:
+                    if comp[j] != ci:
+                        px, py, pz = points[j]
+                        d2 = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                        cand = (d2, i, j, j) if i < j else (d2, j, i, j)
+                        if best is None or cand < best:
+                            best = cand
+            else:
+                a = (box_d2(left[node], x, y, z), left[node])
+                b = (box_d2(right[node], x, y, z), right[node])
+                # nearer child on top of the stack, so good bounds come early
+                if a < b:
+                    a, b = b, a
+                stack.append(a)
+                stack.append(b)
+        return best
+
+    dsu = DSU(n)
+    cache = [None] * n
+    last = None
+    while dsu.components > 1:
+        comp = [dsu.find(j) for j in range(n)]
+        # component of every node, or -1 when it mixes components
+        node_comp = [0] * n_nodes
+        for node in range(n_nodes - 1, -1, -1):
+            if left[node] == -1:
+                first = comp[order[start[node]]]
+                same = all(comp[j] == first for j in order[start[node]:end[node]])
+                node_comp[node] = first if same else -1
+            else:
+                a, b = node_comp[left[node]], node_comp[right[node]]
+                node_comp[node] = a if a == b else -1
+
+        best_out = {}
+        for i in range(n):
+            cand = cache[i]
+            if cand is None or comp[cand[3]] == comp[i]:
+                cand = cache[i] = nearest_foreign(i, comp, node_comp)
+            c = comp[i]
+            if c not in best_out or cand < best_out[c]:
+                best_out[c] = cand
+
+        for d2, a, b, _ in best_out.values():
+            if dsu.union(a, b) and (last is None or (d2, a, b) > last):
+                last = (d2, a, b)
+    return last[1], last[2]
+
+def last_connection_prim(points):
+    """
+    Longest edge of the minimum spanning tree via dense Prim's algorithm:
+    O(n^2) time, O(n) memory, no edge list. Each new tree vertex updates the
+    distance row to all other points in one vectorized step.
+    Edges are compared by (d2, i, j) both when relaxing and when picking the
+    next vertex, so Prim builds the same unique MST that Kruskal does, and its
+    largest edge is exactly Kruskal's last effective union.
+    """
+    n = len(points)
+    if n < 2:
+        return None
+    pts = np.array(points, dtype=np.int64)
+    unreached = np.iinfo(np.int64).max
+    idx = np.arange(n)
+
+    def dist_row(v):
+        diff = pts - pts[v]
+        return np.einsum("ij,ij->i", diff, diff)
+
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    # best edge (dist, a, b) from every vertex to the tree, a < b
+    dist = dist_row(0)
+    dist[0] = unreached
+    edge_a = np.zeros(n, dtype=np.int64)
+    edge_b = idx.copy()
+
+    best = None
+    for _ in range(n - 1):
+        ties = np.flatnonzero(dist == dist.min())
+        v = int(ties[np.lexsort((edge_b[ties], edge_a[ties]))[0]])
+        edge = (int(dist[v]), int(edge_a[v]), int(edge_b[v]))
+        if best is None or edge > best:
+            best = edge
+        in_tree[v] = True
+        dist[v] = unreached
+        row = dist_row(v)
+        a = np.minimum(idx, v)
+        b = np.maximum(idx, v)
+        closer = (row < dist) | ((row == dist) & ((a < edge_a) | ((a == edge_a) & (b < edge_b))))
+        closer &= ~in_tree
+        dist[closer] = row[closer]
+        edge_a[closer] = a[closer]
+        edge_b[closer] = b[closer]
+    return best[1], best[2]
+
+def solve(path="input.txt", K=1000, part2_method="kdtree", part1_method="numpy"):
     points = parse_points(path)
     n = len(points)
     if n == 0:
         return 0, 0
 
-    edges = build_sorted_edges(points)
-
     # Part 1: apply first K closest pairs
-    dsu1 = DSU(n)
-    for idx in range(min(K, len(edges))):
-        _, i, j = edges[idx]
-        dsu1.union(i, j)
-    part1_ans = part1_product_of_top3(dsu1)
+    dsu1 = ArrayDSU(n)
+    dsu1.union_many((i, j) for _, i, j in k_closest_pairs(points, K, method=part1_method))
+    part1_ans = dsu1.top3_product()
 
     # Part 2: continue until a single component
-    dsu2 = DSU(n)
+    if part2_method == "brute":
+        last = last_connection_brute(points)
+    elif part2_method == "prim":
+        last = last_connection_prim(points)
+    elif part2_method == "kdtree":
+        last = last_connection_kdtree(points)
+    else:
+        raise ValueError(f"Unknown part2_method: {part2_method}")
     last_pair_x_product = 0
-    # We must re-run from the beginning to guarantee correct order for part 2.
-    for _, i, j in edges:
-        if dsu2.union(i, j):
-            # This was an effective connection
-            if dsu2.components == 1:
-                xi, xj = points[i][0], points[j][0]
-                last_pair_x_product = xi * xj
-                break
+    if last is not None:
+        i, j = last
+        last_pair_x_product = points[i][0] * points[j][0]
 
     return part1_ans, last_pair_x_product
 
 def main():
     path = sys.argv[1] if len(sys.argv) > 1 else "input.txt"
     K = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
-    part1, part2 = solve(path, K)
+    part1_method = sys.argv[3] if len(sys.argv) > 3 else "numpy"
+    part2_method = sys.argv[4] if len(sys.argv) > 4 else "kdtree"
+    part1, part2 = solve(path, K, part2_method, part1_method)
     print(part1)
     print(part2)
 
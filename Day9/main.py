@@ -35,6 +35,67 @@ def largest_rectangle_any(points):
     return best
 
 
+def _staircases(points):
+    """
+    Lower-left (minimal) and upper-right (maximal) staircases, both sorted by
+    x ascending, so y descends along each.
+    """
+    lower = []
+    for x, y in sorted(points):
+        if not lower or y < lower[-1][1]:
+            lower.append((x, y))
+    upper = []
+    for x, y in sorted(points, reverse=True):
+        if not upper or y > upper[-1][1]:
+            upper.append((x, y))
+    upper.reverse()
+    return lower, upper
+
+
+def _best_between(lower, upper):
+    """
+    max (ux - lx) * (uy - ly) over lower x upper. The product is bilinear, so
+    the best partner index in `upper` never moves left as we walk `lower`;
+    divide and conquer on that gives O(k log k).
+    """
+    best = 0
+    # (lower range, upper range) still to search
+    stack = [(0, len(lower) - 1, 0, len(upper) - 1)]
+    while stack:
+        lo, hi, opt_lo, opt_hi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        lx, ly = lower[mid]
+        best_j = opt_lo
+        best_val = None
+        for j in range(opt_lo, opt_hi + 1):
+            ux, uy = upper[j]
+            val = (ux - lx) * (uy - ly)
+            if best_val is None or val > best_val:
+                best_val = val
+                best_j = j
+        if best_val > best:
+            best = best_val
+        stack.append((lo, mid - 1, opt_lo, best_j))
+        stack.append((mid + 1, hi, best_j, opt_hi))
+    return best
+
+
+def largest_rectangle_staircase(points, brute_force_below=64):
+    """
+    Same result as largest_rectangle_any in O(n log n).
+    For corners with dx, dy of the same sign the best pair is one point on the
+    lower-left staircase and one on the upper-right staircase; mirroring y
+    covers the opposite diagonal. Tiny inputs use the brute-force scan.
+    """
+    if len(points) < brute_force_below:
+        return largest_rectangle_any(points)
+    best = _best_between(*_staircases(points))
+    mirrored = [(x, -y) for x, y in points]
+    return max(best, _best_between(*_staircases(mirrored)))
+
+
 # ------------------------------------------------------------
 # Coordinate compression
 # ------------------------------------------------------------
@@ -243,7 +304,7 @@ def largest_rectangle_red_green(points):
 def main():
     points = parse_input("input.txt")
 
-    print("Part 1:", largest_rectangle_any(points))
+    print("Part 1:", largest_rectangle_staircase(points))
     print("Part 2:", largest_rectangle_red_green(points))
 
 